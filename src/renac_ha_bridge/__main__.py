@@ -1,25 +1,26 @@
 """Entry point for the RENAC Home Assistant bridge (multi-device)."""
 
 import asyncio
+import concurrent.futures
 import os
 import signal
 import logging
-import time
-from typing import Any, Callable, Awaitable, Optional, Dict, Iterable
+from functools import partial, wraps
+from typing import Any, Callable, Awaitable, Optional, Dict, Iterable, TypeVar
 
 from renac_ble import RenacWallboxBLE, RenacInverterBLE, WorkMode
 from renac_ha_mqtt import RenacInverterDevice, RenacWallboxDevice
 
 # --------------------------------------------------------------------------- #
-# Config & logging
+# Config
 # --------------------------------------------------------------------------- #
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-
 MQTT_HOST = os.getenv("MQTT_HOST", "127.0.0.1")
 MQTT_PORT = int(os.getenv("MQTT_PORT", 1883))
 MQTT_USER = os.getenv("MQTT_USER", "renacble")
 MQTT_PASSWORD = os.getenv("MQTT_PASSWORD", "renacble")
+# Stable, unique client id for a persistent MQTT session (optional)
+MQTT_CLIENT_ID = os.getenv("MQTT_CLIENT_ID") or None
 
 # Backward-compatible singles:
 INVERTER_ADDR_LEGACY = os.getenv("RENAC_INVERTER_ADDR")
@@ -32,16 +33,21 @@ WALLBOX_ADDRS = os.getenv("RENAC_WALLBOX_ADDRS", "")
 POLL_INTERVAL_S = float(os.getenv("RENAC_POLL_INTERVAL_S", "5"))
 # Separate interval for refreshing actuator states
 ACTUATOR_POLL_INTERVAL_S = float(os.getenv("RENAC_ACTUATOR_POLL_INTERVAL_S", "30"))
+# Minimum interval between MQTT publishes of wallbox notifications
+WALLBOX_PUBLISH_INTERVAL_S = float(os.getenv("RENAC_WALLBOX_PUBLISH_INTERVAL_S", "1"))
 
-shutdown_event = asyncio.Event()
+# BLE reads are retried on timeout before the link is torn down
+READ_ATTEMPTS = 3
+READ_RETRY_BACKOFF_S = 0.2
+# Reconnect delay doubles per consecutive failure, up to this cap
+RECONNECT_MAX_DELAY_S = 60
+# A link must stay up this long before the reconnect delay starts over
+STABLE_LINK_S = 60
 
 # Keep MQTT device objects per BLE address
 inverter_mqtt_by_addr: Dict[str, RenacInverterDevice] = {}
 wallbox_mqtt_by_addr: Dict[str, RenacWallboxDevice] = {}
 
-# filter some fields out of wallbox telemetry
-WALLBOX_EXCLUDED_KEYS = {"sn", "model", "manufacturer", "version", "update_time"}
-
 
 # --------------------------------------------------------------------------- #
 # Helpers
@@ -49,91 +55,194 @@ WALLBOX_EXCLUDED_KEYS = {"sn", "model", "manufacturer", "version", "update_time"
 
 def _split_addrs(value: str) -> list[str]:
     """Split comma/space-separated address list, trim, dedupe, preserve order."""
-    if not value:
-        return []
-    raw = [p.strip() for p in value.replace(",", " ").split()]
-    seen = set()
-    out: list[str] = []
-    for a in raw:
-        if a and a not in seen:
-            seen.add(a)
-            out.append(a)
-    return out
+    return list(dict.fromkeys(value.replace(",", " ").split()))
 
 
 def _resolve_inverter_addrs() -> list[str]:
-    addrs = _split_addrs(INVERTER_ADDRS)
-    if INVERTER_ADDR_LEGACY:
-        addrs = [INVERTER_ADDR_LEGACY] + [a for a in addrs if a != INVERTER_ADDR_LEGACY]
-    return addrs
+    legacy = [INVERTER_ADDR_LEGACY] if INVERTER_ADDR_LEGACY else []
+    return list(dict.fromkeys(legacy + _split_addrs(INVERTER_ADDRS)))
 
 
 def _resolve_wallbox_addrs() -> list[str]:
-    addrs = _split_addrs(WALLBOX_ADDRS)
-    if WALLBOX_ADDR_LEGACY:
-        addrs = [WALLBOX_ADDR_LEGACY] + [a for a in addrs if a != WALLBOX_ADDR_LEGACY]
-    return addrs
+    legacy = [WALLBOX_ADDR_LEGACY] if WALLBOX_ADDR_LEGACY else []
+    return list(dict.fromkeys(legacy + _split_addrs(WALLBOX_ADDRS)))
 
 
 def wrap_async_callback(loop: asyncio.AbstractEventLoop,
-                        coro_func: Callable[[Any], Awaitable[Optional[bool]]]
+                        coro_func: Callable[[Any], Awaitable[Optional[bool]]],
+                        wait: bool = True,
+                        on_failure: Optional[Callable[[], Any]] = None,
                         ) -> Callable[[Any], Optional[bool]]:
-    """Wrap an async setter so it can be called by sync actuator callbacks."""
+    """Wrap an async setter so it can be called by sync actuator callbacks.
+
+    With ``wait=False`` the coroutine is only scheduled and the wrapper
+    returns ``None`` immediately instead of blocking on its result. A
+    failure is then logged and reported through ``on_failure``, so the
+    caller can correct the state it already published.
+    """
+    name = getattr(coro_func, "__name__", coro_func)
+    submit = asyncio.run_coroutine_threadsafe
+
+    def _report_failure(fut: "concurrent.futures.Future[Optional[bool]]") -> None:
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            logging.error("Error executing %s: %s", name, exc)
+        elif fut.result() is False:
+            logging.warning("%s failed or was rejected", name)
+        else:
+            return
+        if on_failure is not None:
+            on_failure()
+
     def wrapper(value: Any) -> Optional[bool]:
-        fut = asyncio.run_coroutine_threadsafe(coro_func(value), loop)
+        fut = submit(coro_func(value), loop)
+        if not wait:
+            fut.add_done_callback(_report_failure)
+            return None
         try:
             return fut.result()
         except Exception as exc:  # pragma: no cover - best-effort logging
-            logging.error("Error executing %s: %s", getattr(coro_func, "__name__", coro_func), exc)
+            logging.error("Error executing %s: %s", name, exc)
             return False
     return wrapper
 
 
+T = TypeVar("T")
+
+
+async def _retry(fn: Callable[[], Awaitable[T]],
+                 attempts: int = READ_ATTEMPTS,
+                 backoff: float = READ_RETRY_BACKOFF_S,
+                 link: Optional[asyncio.Lock] = None) -> T:
+    """Await ``fn()``, retrying timeouts with exponential backoff.
+
+    Other errors propagate immediately so the caller can reconnect. With
+    ``link`` the lock is held across all attempts: a late reply to a timed
+    out request must not be taken as the answer to someone else's request.
+    """
+    if link is not None:
+        async with link:
+            return await _retry(fn, attempts, backoff)
+    for attempt in range(attempts - 1):
+        try:
+            return await fn()
+        except TimeoutError:
+            await asyncio.sleep(backoff * 2 ** attempt)
+    return await fn()
+
+
+def _serialized(lock: asyncio.Lock, fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Wrap ``fn`` so that calls holding the same ``lock`` never overlap.
+
+    Used for BLE requests: replies on one link are not tagged, so only one
+    request/response exchange may be in flight per device.
+    """
+    @wraps(fn)
+    async def call(*args: Any) -> T:
+        async with lock:
+            return await fn(*args)
+    return call
+
+
+def _reconnect_delay(failures: int) -> float:
+    """Delay before the next reconnect after ``failures`` consecutive failures."""
+    return min(RECONNECT_MAX_DELAY_S, 2 ** failures)
+
+
+def _link_was_stable(connected_at: Optional[float]) -> bool:
+    """Whether a link that came up at ``connected_at`` (loop time) stayed up for ``STABLE_LINK_S``."""
+    return connected_at is not None and asyncio.get_running_loop().time() - connected_at >= STABLE_LINK_S
+
+
 # --------------------------------------------------------------------------- #
 # Wallbox pipeline (one task per device)
 # --------------------------------------------------------------------------- #
 
-def make_wallbox_callback(ble_addr: str) -> Callable[[Dict[str, Any]], None]:
-    """Create a per-wallbox callback that forwards telemetry to its MQTT device."""
+def _publish_wallbox_telemetry(ble_addr: str, parsed: Dict[str, Any]) -> None:
+    """Forward wallbox telemetry to its MQTT device, creating it on first use."""
+    dev = wallbox_mqtt_by_addr.get(ble_addr)
+    if dev is None:
+        # Build device on first telemetry (we need serial/model)
+        dev = RenacWallboxDevice(
+            device_name=f"RENAC Wallbox",
+            serial_number=parsed.get("sn"),
+            model=parsed.get("model"),
+            mqtt_host=MQTT_HOST,
+            mqtt_port=MQTT_PORT,
+            mqtt_user=MQTT_USER,
+            mqtt_password=MQTT_PASSWORD,
+            mqtt_client_id=MQTT_CLIENT_ID,
+        )
+        dev.connect()
+        wallbox_mqtt_by_addr[ble_addr] = dev
+        logging.info("🔌 MQTT device created for wallbox %s (sn=%s model=%s)",
+                     ble_addr, parsed.get("sn"), parsed.get("model"))
+    # Non-entity fields (sn, model, version, ...) are dropped by the device
+    dev.set_sensor_value(parsed)
+
+
+def make_wallbox_callback(latest: Dict[str, Any],
+                          pending: asyncio.Event) -> Callable[[Dict[str, Any]], None]:
+    """Create a per-wallbox callback that buffers telemetry in ``latest``.
+
+    Publishing is left to :func:`run_wallbox_publisher`, woken via ``pending``.
+    """
+    loop = asyncio.get_running_loop()
+
     def _callback(parsed: Dict[str, Any]) -> None:
-        dev = wallbox_mqtt_by_addr.get(ble_addr)
-        if dev is None:
-            # Build device on first telemetry (we need serial/model)
-            dev = RenacWallboxDevice(
-                device_name=f"RENAC Wallbox",
-                serial_number=parsed.get("sn"),
-                model=parsed.get("model"),
-                mqtt_host=MQTT_HOST,
-                mqtt_port=MQTT_PORT,
-                mqtt_user=MQTT_USER,
-                mqtt_password=MQTT_PASSWORD,
-            )
-            dev.connect()
-            wallbox_mqtt_by_addr[ble_addr] = dev
-            logging.info("🔌 MQTT device created for wallbox %s (sn=%s model=%s)",
-                         ble_addr, parsed.get("sn"), parsed.get("model"))
-        dev.set_sensor_value({k: v for k, v in parsed.items() if k not in WALLBOX_EXCLUDED_KEYS})
+        latest.update(parsed)
+        loop.call_soon_threadsafe(pending.set)
     return _callback
 
 
+async def run_wallbox_publisher(ble_addr: str, latest: Dict[str, Any], pending: asyncio.Event) -> None:
+    """Publish buffered wallbox telemetry at most once per ``WALLBOX_PUBLISH_INTERVAL_S``."""
+    while True:
+        await pending.wait()
+        pending.clear()
+        try:
+            _publish_wallbox_telemetry(ble_addr, dict(latest))
+        except Exception:
+            logging.exception("Wallbox publish error (%s)", ble_addr)
+        await asyncio.sleep(WALLBOX_PUBLISH_INTERVAL_S)
+
+
 async def run_wallbox_task(ble_addr: str) -> None:
     """Loop to keep a wallbox connected and forwarding notifications."""
-    wallbox = RenacWallboxBLE(ble_addr, on_notification=make_wallbox_callback(ble_addr))
-
-    while not shutdown_event.is_set():
+    latest: Dict[str, Any] = {}
+    pending = asyncio.Event()
+    wallbox = RenacWallboxBLE(ble_addr, on_notification=make_wallbox_callback(latest, pending))
+    # Both run until cancelled; the group waits for both on shutdown
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(run_wallbox_publisher(ble_addr, latest, pending), name=f"wallbox-publisher:{ble_addr}")
+        tg.create_task(_run_wallbox_connection(ble_addr, wallbox), name=f"wallbox-connection:{ble_addr}")
+
+
+async def _run_wallbox_connection(ble_addr: str, wallbox: RenacWallboxBLE) -> None:
+    """Keep ``wallbox`` connected; notifications flow while the link is up."""
+    failures = 0
+    while True:
+        connected_at = None
         try:
             await wallbox.connect()
             logging.info("⚡️ Connected to wallbox %s", ble_addr)
+            connected_at = asyncio.get_running_loop().time()
 
             # Keep connection alive; all data flows via notifications
-            while not shutdown_event.is_set():
-                if not wallbox.is_connected():
-                    raise ConnectionError(f"Wallbox {ble_addr} disconnected")
+            while wallbox.is_connected():
                 await asyncio.sleep(POLL_INTERVAL_S)
+            raise ConnectionError(f"Wallbox {ble_addr} disconnected")
 
         except Exception:
-            logging.exception("Wallbox loop error (%s). Reconnecting in 5s...", ble_addr)
-            await asyncio.sleep(5)
+            # A link that drops right after connecting still counts as a failure
+            if _link_was_stable(connected_at):
+                failures = 0
+            delay = _reconnect_delay(failures)
+            failures += 1
+            logging.exception("Wallbox loop error (%s). Reconnecting in %ss...", ble_addr, delay)
+            await asyncio.sleep(delay)
         finally:
             try:
                 await wallbox.disconnect()
@@ -145,121 +254,130 @@ async def run_wallbox_task(ble_addr: str) -> None:
 # Inverter pipeline (one task per device)
 # --------------------------------------------------------------------------- #
 
+# (actuator, getter, setter) with getter/setter as RenacInverterBLE method names
+INVERTER_ACTUATORS = (
+    ("max_charge_current", "get_max_charge_current", "set_max_charge_current"),
+    ("max_discharge_current", "get_max_discharge_current", "set_max_discharge_current"),
+    ("min_soc", "get_min_soc", "set_min_soc"),
+    ("min_soc_on_grid", "get_min_soc_on_grid", "set_min_soc_on_grid"),
+    ("export_limit", "get_export_limit", "set_export_limit"),
+    ("power_limit_percent", "get_power_limit_percent", "set_power_limit_percent"),
+    ("work_mode", "get_work_mode", "set_work_mode"),
+)
+
+# Work mode <-> Home Assistant select option, computed once
+WORK_MODE_NAMES: Dict[WorkMode, str] = {mode: mode.name.lower() for mode in WorkMode}
+WORK_MODES_BY_NAME: Dict[str, WorkMode] = {name: mode for mode, name in WORK_MODE_NAMES.items()}
+
+
+def _work_mode_setter(set_work_mode: Callable[[WorkMode], Awaitable[bool]]) -> Callable[[str], Awaitable[bool]]:
+    """Adapt a ``WorkMode`` setter to the option names Home Assistant sends."""
+    @wraps(set_work_mode)
+    async def _set_work_mode(value: str) -> bool:
+        mode = WORK_MODES_BY_NAME.get(value.lower())
+        if mode is None:
+            return False
+        return await set_work_mode(mode)
+    return _set_work_mode
+
+
+async def _read_inverter_actuators(inverter: RenacInverterBLE, link: asyncio.Lock) -> Dict[str, Any]:
+    """Read all actuator values, keyed by actuator name.
+
+    The reads are queued together but ``link`` serializes them on the BLE link.
+    """
+    values = await asyncio.gather(*(
+        _retry(getattr(inverter, getter), link=link) for _, getter, _ in INVERTER_ACTUATORS
+    ))
+    actuators = {name: value for (name, _, _), value in zip(INVERTER_ACTUATORS, values)}
+    actuators["work_mode"] = WORK_MODE_NAMES.get(actuators["work_mode"])
+    return actuators
+
+
+async def _poll_inverter_sensors(inverter: RenacInverterBLE, mqtt_dev: RenacInverterDevice,
+                                 link: asyncio.Lock) -> None:
+    """Publish the inverter overview every ``POLL_INTERVAL_S``."""
+    while True:
+        mqtt_dev.set_values_bulk(await _retry(inverter.get_power_and_energy_overview, link=link))
+        await asyncio.sleep(POLL_INTERVAL_S)
+
+
+async def _poll_inverter_actuators(inverter: RenacInverterBLE, mqtt_dev: RenacInverterDevice,
+                                   link: asyncio.Lock, refresh: asyncio.Event) -> None:
+    """Refresh actuator values every ``ACTUATOR_POLL_INTERVAL_S``, or early once ``refresh`` is set."""
+    while True:
+        # Initial values are read while wiring the actuator callbacks
+        try:
+            await asyncio.wait_for(refresh.wait(), ACTUATOR_POLL_INTERVAL_S)
+        except TimeoutError:
+            pass
+        refresh.clear()
+        mqtt_dev.set_values_bulk(await _read_inverter_actuators(inverter, link))
+
+
 async def run_inverter_task(ble_addr: str) -> None:
     """Loop to keep an inverter connected, publish telemetry and wire actuators."""
     inverter = RenacInverterBLE(ble_addr)
+    # Every read and write on this inverter's BLE link goes through this lock
+    link = asyncio.Lock()
     mqtt_dev: Optional[RenacInverterDevice] = None
+    failures = 0
 
-    while not shutdown_event.is_set():
+    while True:
+        connected_at = None
         try:
             await inverter.connect()
             logging.info("⚡️ Connected to inverter %s", ble_addr)
-
-            info = await inverter.get_info()
-            mqtt_dev = RenacInverterDevice(
-                device_name=f"RENAC Inverter",
-                serial_number=info.get("sn"),
-                model=info.get("model"),
-                mqtt_host=MQTT_HOST,
-                mqtt_port=MQTT_PORT,
-                mqtt_user=MQTT_USER,
-                mqtt_password=MQTT_PASSWORD,
-            )
-            mqtt_dev.connect()
-            inverter_mqtt_by_addr[ble_addr] = mqtt_dev
+            connected_at = asyncio.get_running_loop().time()
+
+            # Reuse the MQTT device across BLE reconnects
+            mqtt_dev = inverter_mqtt_by_addr.get(ble_addr)
+            if mqtt_dev is None:
+                info = await _retry(inverter.get_info, link=link)
+                mqtt_dev = RenacInverterDevice(
+                    device_name=f"RENAC Inverter",
+                    serial_number=info.get("sn"),
+                    model=info.get("model"),
+                    mqtt_host=MQTT_HOST,
+                    mqtt_port=MQTT_PORT,
+                    mqtt_user=MQTT_USER,
+                    mqtt_password=MQTT_PASSWORD,
+                    mqtt_client_id=MQTT_CLIENT_ID,
+                )
+                mqtt_dev.connect()
+                inverter_mqtt_by_addr[ble_addr] = mqtt_dev
 
             loop = asyncio.get_running_loop()
-            mqtt_dev.set_actuator_callback(
-                "max_charge_current",
-                wrap_async_callback(loop, inverter.set_max_charge_current),
-                await inverter.get_max_charge_current(),
-            )
-            mqtt_dev.set_actuator_callback(
-                "max_discharge_current",
-                wrap_async_callback(loop, inverter.set_max_discharge_current),
-                await inverter.get_max_discharge_current(),
-            )
-            mqtt_dev.set_actuator_callback(
-                "min_soc",
-                wrap_async_callback(loop, inverter.set_min_soc),
-                await inverter.get_min_soc(),
-            )
-            mqtt_dev.set_actuator_callback(
-                "min_soc_on_grid",
-                wrap_async_callback(loop, inverter.set_min_soc_on_grid),
-                await inverter.get_min_soc_on_grid(),
-            )
-            mqtt_dev.set_actuator_callback(
-                "export_limit",
-                wrap_async_callback(loop, inverter.set_export_limit),
-                await inverter.get_export_limit(),
-            )
-            mqtt_dev.set_actuator_callback(
-                "power_limit_percent",
-                wrap_async_callback(loop, inverter.set_power_limit_percent),
-                await inverter.get_power_limit_percent(),
-            )
-            async def _set_work_mode(value: str) -> bool:
-                try:
-                    mode = WorkMode[value.upper()]
-                except KeyError:
-                    return False
-                return await inverter.set_work_mode(mode)
-
-            current_mode = await inverter.get_work_mode()
-            mqtt_dev.set_actuator_callback(
-                "work_mode",
-                wrap_async_callback(loop, _set_work_mode),
-                current_mode.name.lower() if current_mode is not None else None,
-            )
-
-            last_actuator_poll = time.monotonic()
-
-            # Poll & publish inverter overview periodically
-            while not shutdown_event.is_set():
-                overview = await inverter.get_power_and_energy_overview()
-                mqtt_dev.set_sensor_value(overview)
-
-                now = time.monotonic()
-                if now - last_actuator_poll >= ACTUATOR_POLL_INTERVAL_S:
-                    last_actuator_poll = now
-                    mqtt_dev.set_actuator_value(
-                        "max_charge_current",
-                        await inverter.get_max_charge_current(),
-                    )
-                    mqtt_dev.set_actuator_value(
-                        "max_discharge_current",
-                        await inverter.get_max_discharge_current(),
-                    )
-                    mqtt_dev.set_actuator_value(
-                        "min_soc",
-                        await inverter.get_min_soc(),
-                    )
-                    mqtt_dev.set_actuator_value(
-                        "min_soc_on_grid",
-                        await inverter.get_min_soc_on_grid(),
-                    )
-                    mqtt_dev.set_actuator_value(
-                        "export_limit",
-                        await inverter.get_export_limit(),
-                    )
-                    mqtt_dev.set_actuator_value(
-                        "power_limit_percent",
-                        await inverter.get_power_limit_percent(),
-                    )
-                    work_mode = await inverter.get_work_mode()
-                    mqtt_dev.set_actuator_value(
-                        "work_mode",
-                        work_mode.name.lower() if work_mode is not None else None,
-                    )
-
-                if not inverter.is_connected():
-                    raise ConnectionError(f"Inverter {ble_addr} disconnected")
-                await asyncio.sleep(POLL_INTERVAL_S)
+            actuators = await _read_inverter_actuators(inverter, link)
+            setters = {name: _serialized(link, getattr(inverter, setter)) for name, _, setter in INVERTER_ACTUATORS}
+            # Home Assistant sends work mode option names, not WorkMode members
+            setters["work_mode"] = _work_mode_setter(setters["work_mode"])
+            # Commands are published optimistically; a failed setter triggers an
+            # immediate re-read so Home Assistant shows the actual value again.
+            refresh = asyncio.Event()
+            on_failure = partial(loop.call_soon_threadsafe, refresh.set)
+            for name, setter in setters.items():
+                mqtt_dev.set_actuator_callback(name, wrap_async_callback(loop, setter, wait=False, on_failure=on_failure))
+            # One publish of the retained state group for all initial values
+            mqtt_dev.set_values_bulk(actuators)
+
+            # Sensors and actuators are polled on independent cadences; leaving
+            # the group (disconnect or a failed read) cancels both loops.
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(_poll_inverter_sensors(inverter, mqtt_dev, link))
+                tg.create_task(_poll_inverter_actuators(inverter, mqtt_dev, link, refresh))
+                while inverter.is_connected():
+                    await asyncio.sleep(POLL_INTERVAL_S)
+                raise ConnectionError(f"Inverter {ble_addr} disconnected")
 
         except Exception:
-            logging.exception("Inverter loop error (%s). Reconnecting in 5s...", ble_addr)
-            await asyncio.sleep(5)
+            # A link that drops right after connecting still counts as a failure
+            if _link_was_stable(connected_at):
+                failures = 0
+            delay = _reconnect_delay(failures)
+            failures += 1
+            logging.exception("Inverter loop error (%s). Reconnecting in %ss...", ble_addr, delay)
+            await asyncio.sleep(delay)
         finally:
             try:
                 await inverter.disconnect()
@@ -271,48 +389,61 @@ async def run_inverter_task(ble_addr: str) -> None:
 # Entrypoint
 # --------------------------------------------------------------------------- #
 
-def _shutdown_handler() -> None:
-    shutdown_event.set()
+def _shutdown_handler(main_task: asyncio.Task) -> None:
+    """Cancel ``main_task``; the cancellation propagates to every device task."""
+    main_task.get_loop().call_soon_threadsafe(main_task.cancel)
 
 
 async def _run_all(inverter_addrs: Iterable[str], wallbox_addrs: Iterable[str]) -> None:
-    tasks: list[asyncio.Task] = []
-
-    for addr in inverter_addrs:
-        tasks.append(asyncio.create_task(run_inverter_task(addr), name=f"inverter:{addr}"))
-    for addr in wallbox_addrs:
-        tasks.append(asyncio.create_task(run_wallbox_task(addr), name=f"wallbox:{addr}"))
-
-    if not tasks:
+    inverter_addrs = list(inverter_addrs)
+    wallbox_addrs = list(wallbox_addrs)
+    if not inverter_addrs and not wallbox_addrs:
         raise SystemExit(
             "No devices configured. Set RENAC_INVERTER_ADDR(S) and/or RENAC_WALLBOX_ADDR(S)."
         )
 
-    # Wait until shutdown, then cancel all tasks
     try:
-        await shutdown_event.wait()
+        async with asyncio.TaskGroup() as tg:
+            for addr in inverter_addrs:
+                tg.create_task(run_inverter_task(addr), name=f"inverter:{addr}")
+            for addr in wallbox_addrs:
+                tg.create_task(run_wallbox_task(addr), name=f"wallbox:{addr}")
     finally:
-        for t in tasks:
-            t.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Go offline cleanly rather than leaving it to the MQTT last will
+        for dev in (*inverter_mqtt_by_addr.values(), *wallbox_mqtt_by_addr.values()):
+            try:
+                dev.disconnect()
+            except Exception:
+                logging.exception("MQTT disconnect failed for %s", dev.device_id)
 
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
     inverter_addrs = _resolve_inverter_addrs()
     wallbox_addrs = _resolve_wallbox_addrs()
 
     logging.info("Starting RENAC bridge | inverters=%s | wallboxes=%s",
                  inverter_addrs or "[]", wallbox_addrs or "[]")
 
-    loop = asyncio.new_event_loop()
+    try:
+        import uvloop
+    except ImportError:  # optional speedup (not available on Windows)
+        loop = asyncio.new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
     asyncio.set_event_loop(loop)
+    main_task = loop.create_task(_run_all(inverter_addrs, wallbox_addrs))
     for sig in (signal.SIGINT, signal.SIGTERM):
         try:
-            loop.add_signal_handler(sig, _shutdown_handler)
+            loop.add_signal_handler(sig, _shutdown_handler, main_task)
         except NotImplementedError:
             pass  # Windows
 
-    loop.run_until_complete(_run_all(inverter_addrs, wallbox_addrs))
+    try:
+        loop.run_until_complete(main_task)
+    except asyncio.CancelledError:
+        pass  # shutdown requested
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,7 @@
-from renac_ha_mqtt.mqtt_device import RenacMqttDevice, MqttDeviceEntities
-from typing import Optional
+from renac_ha_mqtt.mqtt_device import RenacMqttDevice, FrozenEntities, freeze_entities, BATCHED_ENTITY_TYPES
+from typing import Optional, Iterable
 
-INVERTER_ENTITIES: MqttDeviceEntities = {
+INVERTER_ENTITIES: FrozenEntities = freeze_entities({
     "number": {
         "max_charge_current": {
             "unit_of_measurement": "A",
@@ -176,10 +176,12 @@ INVERTER_ENTITIES: MqttDeviceEntities = {
             "state_class": "measurement",
         },
     }
-}
+})
 
 
 class RenacInverterDevice(RenacMqttDevice):
+    __slots__ = ()
+
     def __init__(
             self,
             device_name: str,
@@ -189,6 +191,9 @@ class RenacInverterDevice(RenacMqttDevice):
             mqtt_port: int = 1883,
             mqtt_user: Optional[str] = None,
             mqtt_password: Optional[str] = None,
+            batched_entity_types: Iterable[str] = BATCHED_ENTITY_TYPES,
+            retain_telemetry: bool = False,
+            mqtt_client_id: Optional[str] = None,
     ):
         super().__init__(
             f"inverter_{serial_number}",
@@ -199,4 +204,7 @@ class RenacInverterDevice(RenacMqttDevice):
             mqtt_port,
             mqtt_user,
             mqtt_password,
+            batched_entity_types,
+            retain_telemetry,
+            mqtt_client_id,
         )
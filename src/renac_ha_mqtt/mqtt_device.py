@@ -1,22 +1,47 @@
 """MQTT device helpers for RENAC hardware."""
 
-import time
+import re
+import math
 import json
+import sys
+import socket
 import logging
+import threading
 import paho.mqtt.client as mqtt
-from typing import Any, Callable, TypedDict, Optional, Dict, Union, List
+from types import MappingProxyType
+from typing import Any, Callable, TypedDict, Optional, Dict, Union, List, Tuple, Mapping, Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+else:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+
 
 ActuatorPayload = Union[int, float, str, bool, Dict[str, Any], List[Any]]
 ActuatorCallback = Callable[[ActuatorPayload], Optional[bool]]
 
 
-class SensorConfig(TypedDict, total=False):
+class PublishConfig(TypedDict, total=False):
+    """Per-entity state publishing options (not sent to Home Assistant)."""
+    retained: bool
+    qos: int
+
+
+class SensorConfig(PublishConfig, total=False):
     unit_of_measurement: str
     device_class: str
     state_class: str
 
 
-class NumberConfig(TypedDict, total=False):
+class NumberConfig(PublishConfig, total=False):
     unit_of_measurement: str
     min: int
     max: int
@@ -24,7 +49,7 @@ class NumberConfig(TypedDict, total=False):
     mode: str
 
 
-class SelectConfig(TypedDict, total=False):
+class SelectConfig(PublishConfig, total=False):
     options: List[str]
 
 
@@ -34,18 +59,205 @@ class MqttDeviceEntities(TypedDict, total=False):
     select: Dict[str, SelectConfig]
 
 
+FrozenEntities = Mapping[str, Mapping[str, Mapping[str, Any]]]
+
+
+def freeze_entities(entities: MqttDeviceEntities) -> FrozenEntities:
+    """Return a read-only view of ``entities`` safe to share between devices."""
+    return MappingProxyType({
+        entity_type: MappingProxyType({
+            sys.intern(key): MappingProxyType(dict(config)) for key, config in entity_dict.items()
+        })
+        for entity_type, entity_dict in entities.items()
+    })
+
+
+def _encode_value(value: Any) -> bytes:
+    """Encode a state value as an MQTT payload.
+
+    Scalars are encoded the same way paho would encode them; anything else is
+    serialised as JSON.
+    """
+    if isinstance(value, (int, float)):
+        return str(value).encode("ascii")
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if value is None:
+        return b""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return _json_dumps(value)
+
+
+# Entity types whose state is published as combined JSON by default
+BATCHED_ENTITY_TYPES = ("sensor", "number", "select")
+
+# Home Assistant announces restarts here; non-retained state is then republished
+HA_STATUS_TOPIC = "homeassistant/status"
+# Give Home Assistant time to subscribe to entity state topics after its birth message
+HA_STATUS_REPUBLISH_DELAY_S = 5.0
+
+
+class _SharedMqttClient:
+    """A paho client shared by every device talking to the same broker.
+
+    Devices attach on ``connect()`` and detach on ``disconnect()``; the MQTT
+    connection is opened by the first device and closed with the last one.
+    Each device subscribes to its own command topics through a topic-specific
+    message callback, so discovery and state topics stay per device. When
+    Home Assistant comes back online, every device republishes its state.
+    """
+
+    _instances: Dict[Tuple[str, int, Optional[str], Optional[str]], "_SharedMqttClient"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, host: str, port: int, user: Optional[str], password: Optional[str],
+                 client_id: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.devices: List["RenacMqttDevice"] = []
+        self.logger = logging.getLogger(f"renac.mqtt.{host}:{port}")
+
+        # One connection means one last will: it marks the whole bridge offline
+        # and every entity's availability includes this topic. It is named after
+        # the client id, or else the host and user, so that restarts reuse it;
+        # processes sharing a host and user need distinct client ids.
+        self.persistent = bool(client_id)
+        node = client_id or f"renac_ha_mqtt_{'_'.join(filter(None, (socket.gethostname(), user)))}"
+        node = re.sub(r"[^A-Za-z0-9_-]", "_", node)
+        self.availability_topic = f"homeassistant/{node}/availability"
+
+        # Only a caller-supplied (stable, unique) id gets a persistent session,
+        # which keeps command subscriptions across reconnects. Without one the
+        # broker assigns an id and every connection starts clean.
+        self.client = mqtt.Client(client_id=client_id or "", clean_session=not self.persistent)
+        if user:
+            self.client.username_pw_set(user, password)
+        self.client.will_set(self.availability_topic, "offline", retain=True)
+        self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
+        self.client.on_message = self.on_message
+        self.client.message_callback_add(HA_STATUS_TOPIC, self.on_ha_status)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=60)
+        self.connected = False
+
+    @classmethod
+    def get(cls, host: str, port: int, user: Optional[str], password: Optional[str],
+            client_id: Optional[str] = None) -> "_SharedMqttClient":
+        """Return the shared client for ``host``/``port``/``user``/``client_id``, creating it if needed."""
+        key = (host, port, user, client_id)
+        with cls._instances_lock:
+            shared = cls._instances.get(key)
+            if shared is None:
+                shared = cls._instances[key] = cls(host, port, user, password, client_id)
+            return shared
+
+    def attach(self, device: "RenacMqttDevice") -> None:
+        """Add ``device`` to this connection, connecting to the broker if needed."""
+        self.client.message_callback_add(f"homeassistant/+/{device.device_id}/+/set", device.on_message)
+        with self._instances_lock:
+            if device in self.devices:
+                return
+            self.devices.append(device)
+            first = len(self.devices) == 1
+        if first:
+            self.logger.info("🚀 Connecting to MQTT broker...")
+            try:
+                self.client.connect(self.host, self.port, 60)
+            except Exception:
+                with self._instances_lock:
+                    self.devices.remove(device)
+                raise
+            self.client.loop_start()
+            self.logger.info("📡 MQTT loop started")
+        elif self.connected:
+            device.on_connect(self.client, None, {}, 0)
+
+    def detach(self, device: "RenacMqttDevice") -> None:
+        """Remove ``device``; the connection is closed once no devices remain."""
+        self.client.message_callback_remove(f"homeassistant/+/{device.device_id}/+/set")
+        with self._instances_lock:
+            if device not in self.devices:
+                return
+            self.devices.remove(device)
+            last = not self.devices
+        if last:
+            self.client.publish(self.availability_topic, "offline", retain=True)
+            self.client.loop_stop()
+            self.client.disconnect()
+            self.connected = False
+
+    def on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.connected = True
+            self.client.publish(self.availability_topic, "online", retain=True)
+            self.client.subscribe(HA_STATUS_TOPIC)
+        for device in list(self.devices):
+            device.on_connect(client, userdata, flags, rc)
+
+    def on_ha_status(self, client, userdata, msg):
+        """Republish device state once Home Assistant reports it is online."""
+        if msg.payload != b"online":
+            return
+        self.logger.info("🏠 Home Assistant online; republishing state in %ss", HA_STATUS_REPUBLISH_DELAY_S)
+        # Not slept here: that would stall paho's network thread
+        timer = threading.Timer(HA_STATUS_REPUBLISH_DELAY_S, self._republish_state)
+        timer.daemon = True
+        timer.start()
+
+    def _republish_state(self) -> None:
+        for device in list(self.devices):
+            device.republish_state()
+
+    def on_disconnect(self, client, userdata, rc):
+        """Mark devices disconnected; paho's loop thread reconnects with backoff."""
+        self.connected = False
+        for device in list(self.devices):
+            device.on_disconnect(client, userdata, rc)
+        if rc != 0:
+            self.logger.warning("⚠️ MQTT disconnected; paho will auto-reconnect")
+
+    def on_message(self, client, userdata, msg):
+        self.logger.debug("📩 Unhandled MQTT message: %s => %r", msg.topic, msg.payload)
+
+
 class RenacMqttDevice:
-    """Base MQTT device used by the bridge to publish telemetry and accept commands."""
+    """Base MQTT device used by the bridge to publish telemetry and accept commands.
+
+    The state of entity types listed in ``batched_entity_types`` is published
+    as combined JSON (see :meth:`_publish_state`); every other entity gets a
+    plain state topic of its own.
+
+    Actuators and ``total_increasing`` sensors are published retained, other
+    sensors only if ``retain_telemetry`` is set; an entity's ``retained`` and
+    ``qos`` config fields override this. Retained state only helps Home
+    Assistant show a value before the next update arrives, it is not needed
+    for correctness. Discovery configs are always retained with QoS 1.
+    """
+
+    __slots__ = (
+        "device_id", "device_name", "device_model", "entities",
+        "mqtt_host", "mqtt_port", "mqtt_user", "mqtt_password", "mqtt_client_id",
+        "state", "_entity_type_of", "_entity_keys", "_retain_keys", "_qos_of",
+        "state_topic", "telemetry_topic", "_retained_batch", "_telemetry_batch", "_state_qos", "_telemetry_qos",
+        "_entity_state_topics",
+        "_actuator_callbacks", "logger", "_log_debug", "availability_topic",
+        "_shared", "client", "_connected", "_registered", "_publish_lock",
+        "_command_topics", "_command_keys", "_sensor_discovery", "_actuator_discovery",
+    )
 
     def __init__(self,
                  device_id: str,
                  device_name: str,
                  device_model: str,
-                 entities: MqttDeviceEntities,
+                 entities: Union[MqttDeviceEntities, FrozenEntities],
                  mqtt_host: str,
                  mqtt_port: int = 1883,
                  mqtt_user: Optional[str] = None,
-                 mqtt_password: Optional[str] = None):
+                 mqtt_password: Optional[str] = None,
+                 batched_entity_types: Iterable[str] = BATCHED_ENTITY_TYPES,
+                 retain_telemetry: bool = False,
+                 mqtt_client_id: Optional[str] = None):
         self.device_id = device_id
         self.device_name = device_name
         self.device_model = device_model
@@ -54,224 +266,292 @@ class RenacMqttDevice:
         self.mqtt_port = mqtt_port
         self.mqtt_user = mqtt_user
         self.mqtt_password = mqtt_password
+        self.mqtt_client_id = mqtt_client_id
         self.state = {}
+        # Interned so lookups of interned telemetry keys hit the identity fast path
+        self._entity_type_of: Dict[str, str] = {
+            sys.intern(key): entity_type
+            for entity_type, entity_dict in entities.items()
+            for key in entity_dict
+        }
+        self._entity_keys = frozenset(self._entity_type_of)
+        # Actuators and energy totals are retained so Home Assistant gets them
+        # right after a restart; live measurements are not by default, to
+        # avoid showing stale readings.
+        self._retain_keys = frozenset(
+            key
+            for entity_type, entity_dict in entities.items()
+            for key, entity in entity_dict.items()
+            if entity.get("retained", retain_telemetry or entity_type != "sensor"
+                          or entity.get("state_class") == "total_increasing")
+        )
+        self._qos_of: Dict[str, int] = {
+            key: entity.get("qos", 0)
+            for entity_dict in entities.values()
+            for key, entity in entity_dict.items()
+        }
+        self.state_topic = f"homeassistant/{self.device_id}/state"
+        self.telemetry_topic = f"homeassistant/{self.device_id}/telemetry"
+        batched_keys = frozenset(key for entity_type in batched_entity_types for key in entities.get(entity_type, {}))
+        self._retained_batch = batched_keys & self._retain_keys
+        self._telemetry_batch = batched_keys - self._retain_keys
+        # A combined topic is delivered with the highest QoS of its members
+        self._state_qos = max((self._qos_of[key] for key in self._retained_batch), default=0)
+        self._telemetry_qos = max((self._qos_of[key] for key in self._telemetry_batch), default=0)
+        self._entity_state_topics: Dict[str, str] = {
+            key: f"homeassistant/{entity_type}/{self.device_id}/{key}/state"
+            for entity_type, entity_dict in entities.items()
+            for key in entity_dict
+            if key not in batched_keys
+        }
         self._actuator_callbacks: Dict[str, ActuatorCallback] = {}
 
         self.logger = logging.getLogger(f"renac.{device_id}")
+        # Bound once: debug logging sits on the per-value state update path
+        self._log_debug = self.logger.debug
 
-        self.client = mqtt.Client()
-        if self.mqtt_user:
-            self.client.username_pw_set(self.mqtt_user, self.mqtt_password)
-
-        self.client.will_set(f"homeassistant/{self.device_id}/availability", "offline", retain=True)
-        self.client.on_connect = self.on_connect
-        self.client.on_disconnect = self.on_disconnect
-        self.client.on_message = self.on_message
+        self.availability_topic = f"homeassistant/{self.device_id}/availability"
+        self._shared = _SharedMqttClient.get(mqtt_host, mqtt_port, mqtt_user, mqtt_password, mqtt_client_id)
+        self.client = self._shared.client
         self._connected = False
+        self._registered = False
+        self._publish_lock = threading.Lock()
+
+        # Topics and discovery configs never change for a device: build them
+        # once instead of on every (re)connect.
+        self._command_topics: Dict[str, str] = {
+            key: f"homeassistant/{entity_type}/{self.device_id}/{key}/set"
+            for entity_type in ("number", "select")
+            for key in self.entities.get(entity_type, {})
+        }
+        self._command_keys: Dict[str, str] = {topic: key for key, topic in self._command_topics.items()}
+        self._sensor_discovery: List[Tuple[str, bytes]] = []
+        self._actuator_discovery: List[Tuple[str, bytes]] = []
+        # Availability and device info are identical for every entity
+        common = {
+            "availability": [
+                {"topic": self.availability_topic},
+                {"topic": self._shared.availability_topic},
+            ],
+            "availability_mode": "all",
+            "device": {
+                "identifiers": [self.device_id],
+                "name": self.device_name,
+                "manufacturer": "RENAC",
+                "model": self.device_model,
+            },
+        }
+        for entity_type in ("sensor", "number", "select"):
+            discovery = self._sensor_discovery if entity_type == "sensor" else self._actuator_discovery
+            for key, entity in self.entities.get(entity_type, {}).items():
+                discovery.append((
+                    f"homeassistant/{entity_type}/{self.device_id}/{key}/config",
+                    _json_dumps(self._discovery_config(key, entity, common)),
+                ))
 
     def connect(self) -> None:
-        """Connect to the configured MQTT broker and start the network loop."""
-        self.logger.info("🚀 Connecting to MQTT broker...")
-        self.client.connect(self.mqtt_host, self.mqtt_port, 60)
-        self.client.loop_start()
-        self.logger.info("📡 MQTT loop started")
+        """Attach to the shared connection for the configured MQTT broker.
+
+        The connection and its network loop are started by the first device.
+        """
+        self._shared.attach(self)
 
     def disconnect(self) -> None:
-        """Disconnect from the MQTT broker."""
-        self.client.loop_stop()
-        self.client.disconnect()
+        """Mark the device offline and detach it from the shared connection."""
+        self.client.publish(self.availability_topic, "offline", retain=True)
+        self._connected = False
+        self._shared.detach(self)
 
-    def publish(self, topic: str, payload: Any, retain: bool = False) -> None:
+    def publish(self, topic: str, payload: Any, retain: bool = False, qos: int = 0) -> None:
         """Publish ``payload`` on ``topic``.
 
-        ``payload`` is JSON-encoded if it is a mapping or sequence.
+        Scalars are sent as plain text, anything else as JSON; the payload is
+        handed to paho already encoded.
         """
-        if isinstance(payload, (dict, list)):
-            payload = json.dumps(payload)
-        self.client.publish(topic, payload, retain=retain)
+        self.client.publish(topic, _encode_value(payload), qos=qos, retain=retain)
 
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             self.logger.info("✅ MQTT connected")
             self._connected = True
-            self.client.publish(f"homeassistant/{self.device_id}/availability", "online", retain=True)
-            self._register_sensors()
-            self._register_actuators()
+            self.client.publish(self.availability_topic, "online", retain=True)
+            # Retained discovery configs and session subscriptions survive a
+            # reconnect; only register again if the broker lost our session.
+            if not self._registered or not flags.get("session present"):
+                self._register_sensors()
+                self._register_actuators()
+                self._registered = True
         else:
-            self.logger.error(f"❌ MQTT connect failed, code {rc}")
+            self.logger.error("❌ MQTT connect failed, code %s", rc)
 
     def on_disconnect(self, client, userdata, rc):
-        """Attempt to reconnect using an exponential backoff strategy."""
-        self.logger.warning("⚠️ MQTT disconnected. Reconnecting...")
+        """Mark the device disconnected; the shared client handles reconnects."""
         self._connected = False
-        delay = 1
-        attempts = 0
-        while not self._connected and attempts < 10:
-            try:
-                client.reconnect()
-                self.logger.info("✅ MQTT reconnected")
-                self._connected = True
-                return
-            except Exception as e:
-                self.logger.error(f"❌ Reconnect failed: {e}")
-                time.sleep(delay)
-                delay = min(delay * 2, 60)
-                attempts += 1
-        if not self._connected:
-            self.logger.error("❌ Failed to reconnect to MQTT after multiple attempts")
 
     def on_message(self, client, userdata, msg):
-        topic_parts = msg.topic.split('/')
-        if len(topic_parts) >= 5 and topic_parts[-1] == "set":
-            key = topic_parts[-2]
-            payload = msg.payload.decode("utf-8").strip()
-
-            if key in self._actuator_callbacks:
-                try:
-                    value = json.loads(payload)
-                except json.JSONDecodeError:
-                    value = payload
-
-                callback = self._actuator_callbacks[key]
-                self.logger.info(f"🔧 Received command for {key}: {value}")
-                try:
-                    result = callback(value)
-                    if isinstance(result, bool) and result is False:
-                        self.logger.warning(f"⚠️ Command for {key} failed or was rejected")
-                    else:
-                        self.logger.info(f"✅ Command for {key} executed")
-                        self._set_state(key, value)
-                        topic = f"homeassistant/{self.get_entity_type(key)}/{self.device_id}/{key}/state"
-                        self.client.publish(topic, value, retain=True)
-                        self.logger.debug(f"🔄 State updated: {key} = {value}")
-
-                except Exception as e:
-                    self.logger.error(f"❌ Error executing callback for {key}: {e}")
+        key = self._command_keys.get(msg.topic)
+        if key is None:
+            self.logger.debug("📩 Unhandled MQTT message: %s => %r", msg.topic, msg.payload)
+            return
+
+        callback = self._actuator_callbacks.get(key)
+        if callback is None:
+            self.logger.warning("⚠️ No callback found for actuator key: %s", key)
+            return
+
+        try:
+            value = _json_loads(msg.payload)
+        except _JSONDecodeError:
+            value = msg.payload.decode("utf-8").strip()
+
+        self.logger.info("🔧 Received command for %s: %s", key, value)
+        try:
+            result = callback(value)
+            if isinstance(result, bool) and result is False:
+                self.logger.warning("⚠️ Command for %s failed or was rejected", key)
             else:
-                self.logger.warning(f"⚠️ No callback found for actuator key: {key}")
-        else:
-            self.logger.debug(f"📩 Unhandled MQTT message: {msg.topic} => {msg.payload}")
+                self.logger.info("✅ Command for %s executed", key)
+                self._set_state(key, value)
+                self._publish_state((key,))
+                self._log_debug("🔄 State updated: %s = %r", key, value)
+
+        except Exception as e:
+            self.logger.error("❌ Error executing callback for %s: %s", key, e)
+
+    def _discovery_config(self, key: str, entity: Mapping[str, Any],
+                          common: Mapping[str, Any]) -> Dict[str, Any]:
+        """Build the Home Assistant discovery config for one entity.
+
+        ``common`` holds the fields shared by all entities of the device; its
+        values are referenced, not copied.
+        """
+        config = {
+            "name": f"{self.device_name} {key.replace('_', ' ').title()}",
+            "state_topic": self._state_topic_for(key),
+            "unique_id": f"{self.device_id}_{key}",
+            **common,
+        }
+        if key not in self._entity_state_topics:
+            config["value_template"] = self._value_template(key)
+        if key in self._command_topics:
+            config["command_topic"] = self._command_topics[key]
+        config.update(entity)
+        # ``qos`` doubles as Home Assistant's subscription QoS; ``retained`` is ours
+        config.pop("retained", None)
+        return config
 
     def _register_sensors(self):
-        for key, sensor in self.entities.get("sensor", {}).items():
-            base_topic = f"homeassistant/sensor/{self.device_id}/{key}"
-            config = {
-                "name": f"{self.device_name} {key.replace('_', ' ').title()}",
-                "state_topic": f"{base_topic}/state",
-                "unique_id": f"{self.device_id}_{key}",
-                "availability_topic": f"homeassistant/{self.device_id}/availability",
-                "payload_available": "online",
-                "payload_not_available": "offline",
-                "device": {
-                    "identifiers": [self.device_id],
-                    "name": self.device_name,
-                    "manufacturer": "RENAC",
-                    "model": self.device_model,
-                },
-            }
-            config.update(sensor)
-            self.client.publish(f"{base_topic}/config", json.dumps(config), retain=True)
+        for topic, payload in self._sensor_discovery:
+            self.client.publish(topic, payload, qos=1, retain=True)
 
     def _register_actuators(self):
-        for key, number in self.entities.get("number", {}).items():
-            base_topic = f"homeassistant/number/{self.device_id}/{key}"
-            config = {
-                "name": f"{self.device_name} {key.replace('_', ' ').title()}",
-                "state_topic": f"{base_topic}/state",
-                "command_topic": f"{base_topic}/set",
-                "unique_id": f"{self.device_id}_{key}",
-                "availability_topic": f"homeassistant/{self.device_id}/availability",
-                "payload_available": "online",
-                "payload_not_available": "offline",
-                "device": {
-                    "identifiers": [self.device_id],
-                    "name": self.device_name,
-                    "manufacturer": "RENAC",
-                    "model": self.device_model,
-                },
-            }
-            config.update(number)
-            self.client.subscribe(f"{base_topic}/set")
-            self.client.publish(f"{base_topic}/config", json.dumps(config), retain=True)
-
-        for key, select in self.entities.get("select", {}).items():
-            base_topic = f"homeassistant/select/{self.device_id}/{key}"
-            config = {
-                "name": f"{self.device_name} {key.replace('_', ' ').title()}",
-                "state_topic": f"{base_topic}/state",
-                "command_topic": f"{base_topic}/set",
-                "unique_id": f"{self.device_id}_{key}",
-                "availability_topic": f"homeassistant/{self.device_id}/availability",
-                "payload_available": "online",
-                "payload_not_available": "offline",
-                "device": {
-                    "identifiers": [self.device_id],
-                    "name": self.device_name,
-                    "manufacturer": "RENAC",
-                    "model": self.device_model,
-                },
-            }
-            config.update(select)
-            self.client.subscribe(f"{base_topic}/set")
-            self.client.publish(f"{base_topic}/config", json.dumps(config), retain=True)
+        if self._command_topics:
+            # One SUBSCRIBE packet for all command topics
+            self.client.subscribe([(topic, 0) for topic in self._command_topics.values()])
+        for topic, payload in self._actuator_discovery:
+            self.client.publish(topic, payload, qos=1, retain=True)
+
+    def _state_topic_for(self, key: str) -> str:
+        """Return the topic the state of ``key`` is published on."""
+        if key in self._entity_state_topics:
+            return self._entity_state_topics[key]
+        return self.state_topic if key in self._retained_batch else self.telemetry_topic
+
+    @staticmethod
+    def _value_template(key: str) -> str:
+        """Template extracting ``key`` from the JSON published on its state topic."""
+        return f"{{{{ value_json.get('{key}') }}}}"
+
+    def _publish_state(self, keys: Iterable[str]) -> None:
+        """Publish the state for ``keys``.
+
+        Batched keys are published as JSON together with the rest of their
+        group: retained keys on ``state_topic`` with the retain flag, the
+        others on ``telemetry_topic`` without it. Remaining keys are published
+        on their own state topic.
+        """
+        keys = tuple(keys)
+        # State is published from the event loop, paho's network thread and the
+        # republish timer. Snapshot and publish together, so an older snapshot
+        # can never be sent after (and overwrite) a newer one.
+        with self._publish_lock:
+            state = dict(self.state)
+            if not self._retained_batch.isdisjoint(keys):
+                self.publish(self.state_topic, {k: v for k, v in state.items() if k in self._retained_batch},
+                             retain=True, qos=self._state_qos)
+            if not self._telemetry_batch.isdisjoint(keys):
+                self.publish(self.telemetry_topic, {k: v for k, v in state.items() if k in self._telemetry_batch},
+                             qos=self._telemetry_qos)
+            for key in keys:
+                topic = self._entity_state_topics.get(key)
+                if topic is not None:
+                    self.publish(topic, state.get(key), retain=key in self._retain_keys, qos=self._qos_of[key])
+
+    def republish_state(self) -> None:
+        """Publish every known value again, including non-retained telemetry.
+
+        Unchanged values are otherwise not republished, so this lets Home
+        Assistant pick up slow-changing sensors after it restarts.
+        """
+        self._publish_state(dict(self.state))
 
     def _set_state(self, key: str, value: Any) -> bool:
-        """Store ``value`` in the internal state if it changed."""
-        if self.state.get(key) != value:
-            self.logger.debug(f"🔄 State updated: {key} = {value}")
+        """Store ``value`` in the internal state if it changed.
+
+        Floats are compared with :func:`math.isclose`, so conversion noise in
+        otherwise unchanged readings does not trigger a publish.
+        """
+        current = self.state.get(key)
+        if isinstance(value, float) and isinstance(current, float) and math.isclose(current, value):
+            return False
+        if current != value:
+            self._log_debug("🔄 State updated: %s = %r", key, value)
             self.state[key] = value
             return True
         return False
 
+    def set_values_bulk(self, values: Dict[str, Any]) -> bool:
+        """Update several sensor/actuator values and publish them together.
+
+        Changed values are published along with the rest of their state group
+        (see :meth:`_publish_state`). Keys that are not entities of this
+        device are ignored.
+        """
+        entity_keys = self._entity_keys
+        updates = {k: v for k, v in values.items() if k in entity_keys and self._set_state(k, v)}
+        if updates:
+            self._publish_state(updates)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("📤 Published state updates: %s", updates)
+        return bool(updates)
+
     def set_sensor_value(self, key_or_dict: Union[str, Dict[str, Any]], value: Optional[Any] = None) -> bool:
         """Update sensor state and publish MQTT messages.
 
         ``key_or_dict`` may be either a single sensor key or a mapping of
         keys to values. Only changed values are published.
         """
-        updates = {}
         if isinstance(key_or_dict, dict):
-            for k, v in key_or_dict.items():
-                if self._set_state(k, v):
-                    updates[k] = v
-        else:
-            if self._set_state(key_or_dict, value):
-                updates[key_or_dict] = value
-
-        for k, v in updates.items():
-            topic = f"homeassistant/sensor/{self.device_id}/{k}/state"
-            self.client.publish(topic, v, retain=True)
-
-        if updates:
-            self.logger.info(f"📤 Published sensor updates: {updates}")
-
-        return bool(updates)
+            return self.set_values_bulk(key_or_dict)
+        return self.set_values_bulk({key_or_dict: value})
 
     def get_entity_type(self, key: str) -> Optional[str]:
         """Return the entity category for ``key`` if present."""
-        for entity_type, entity_dict in self.entities.items():
-            if key in entity_dict:
-                return entity_type
-        return None
+        return self._entity_type_of.get(key)
 
     def set_actuator_callback(self, key: str, callback: ActuatorCallback,
                               value: Optional[Union[int, float, str, bool]] = None):
-        self._actuator_callbacks[key] = callback
-        self.logger.debug(f"✅ Callback registered for actuator: {key}")
+        self._actuator_callbacks[sys.intern(key)] = callback
+        self.logger.debug("✅ Callback registered for actuator: %s", key)
         if value is not None:
             self._set_state(key, value)
-            topic = f"homeassistant/{self.get_entity_type(key)}/{self.device_id}/{key}/state"
-            self.client.publish(topic, value, retain=True)
-            self.logger.info(f"📤 Initial state published for actuator {key}: {value}")
+            self._publish_state((key,))
+            self.logger.info("📤 Initial state published for actuator %s: %s", key, value)
 
     def set_actuator_value(self, key: str, value: ActuatorPayload) -> bool:
         """Update actuator state and publish MQTT message if it changed."""
-        if self._set_state(key, value):
-            entity_type = self.get_entity_type(key)
-            if entity_type is None:
-                return False
-            topic = f"homeassistant/{entity_type}/{self.device_id}/{key}/state"
-            self.client.publish(topic, value, retain=True)
-            self.logger.info(f"📤 Published actuator update: {key} = {value}")
+        if key in self._entity_keys and self._set_state(key, value):
+            self._publish_state((key,))
+            self.logger.info("📤 Published actuator update: %s = %s", key, value)
             return True
         return False
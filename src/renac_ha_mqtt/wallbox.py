@@ -1,7 +1,7 @@
-from renac_ha_mqtt.mqtt_device import RenacMqttDevice, MqttDeviceEntities
-from typing import Optional
+from renac_ha_mqtt.mqtt_device import RenacMqttDevice, FrozenEntities, freeze_entities, BATCHED_ENTITY_TYPES
+from typing import Optional, Iterable
 
-WALLBOX_ENTITIES: MqttDeviceEntities = {
+WALLBOX_ENTITIES: FrozenEntities = freeze_entities({
     "sensor": {
         "phase_a_voltage": {
             "unit_of_measurement": "V",
@@ -62,10 +62,12 @@ WALLBOX_ENTITIES: MqttDeviceEntities = {
             "options": ["idle", "charging", "paused", "disconnected", "error", "completed", "scheduled"]
         },
     }
-}
+})
 
 
 class RenacWallboxDevice(RenacMqttDevice):
+    __slots__ = ()
+
     def __init__(
             self,
             device_name: str,
@@ -75,6 +77,9 @@ class RenacWallboxDevice(RenacMqttDevice):
             mqtt_port: int = 1883,
             mqtt_user: Optional[str] = None,
             mqtt_password: Optional[str] = None,
+            batched_entity_types: Iterable[str] = BATCHED_ENTITY_TYPES,
+            retain_telemetry: bool = False,
+            mqtt_client_id: Optional[str] = None,
     ):
         super().__init__(
             f"wallbox_{serial_number}",
@@ -85,4 +90,7 @@ class RenacWallboxDevice(RenacMqttDevice):
             mqtt_port,
             mqtt_user,
             mqtt_password,
+            batched_entity_types,
+            retain_telemetry,
+            mqtt_client_id,
         )